@@ -6,12 +6,14 @@ This is a code repository for a streamlit based sql playground to practice basic
 Part of the workshop conducted by Ahmed Muzammil.
 """
 
+import math
 import os
+import tempfile
 import streamlit as st
 import duckdb
 import pandas as pd
+import pyarrow as pa
 from streamlit_ace import st_ace
-import plotly.express as px
 
 # Set page config to wide layout
 st.set_page_config(layout="wide")
@@ -26,43 +28,344 @@ def get_connection():
         Connection: A connection object to the database.
     """
     conn = duckdb.connect(database='sample.db', read_only=False)
+    # Size DuckDB to the host instead of relying on its defaults
+    conn.execute("SET threads = ?;", [os.cpu_count() or 4])
+    conn.execute("PRAGMA memory_limit='2GB';")
+    conn.execute("PRAGMA enable_object_cache=true;")
+    # Let large joins spill to disk instead of failing at the memory limit
+    conn.execute("SET temp_directory = ?;", [os.path.join(tempfile.gettempdir(), 'duckdb_spill')])
+    conn.execute("PRAGMA disable_progress_bar;")
     return conn
 
+def _fetch_arrow(cursor):
+    """
+    Fetches the result of the last query on the cursor as an Arrow table.
+
+    DuckDB 1.5 renamed `fetch_arrow_table()` to `to_arrow_table()` and
+    deprecated the old name, so use the new one where it exists.
+    """
+    fetch = getattr(cursor, 'to_arrow_table', None) or cursor.fetch_arrow_table
+    return fetch()
+
 # Function to execute SQL query
-def run_query(sql_query):
+def _run_query_uncached(sql_query, params=None):
     """
-    Executes the given SQL query and returns the result as a DataFrame.
+    Executes the given SQL query and returns the result as an Arrow table.
+
+    Arrow avoids copying the result into pandas; callers that need a
+    DataFrame convert it with `to_pandas()`.
 
     Args:
         sql_query (str): The SQL query to be executed.
+        params (list, optional): Values bound to the `?` placeholders of the query.
 
     Returns:
-        pandas.DataFrame: The result of the SQL query as a DataFrame.
+        pyarrow.Table: The result of the SQL query as an Arrow table.
 
     """
+    # A cursor per query lets concurrent sessions share the cached connection
+    cursor = get_connection().cursor()
     try:
-        df_result = get_connection().execute(sql_query).fetchdf()
-        return df_result
+        tbl_result = _fetch_arrow(cursor.execute(sql_query, params))
+        return tbl_result
     except duckdb.Error as e:
         st.error(f"Error: {e}")
-        return pd.DataFrame()
+        return pa.table({})
+    finally:
+        cursor.close()
 
-def reset_database():
+@st.cache_data(max_entries=64, ttl=600, show_spinner=False)
+def run_query(sql_query, params=None):
+    """
+    Executes the given SQL query, returning a cached result for repeated SQL.
+
+    Only use this for queries that read data; statements that change the
+    database go through `_run_query_uncached` followed by `clear_cached_results`.
+
+    Args:
+        sql_query (str): The SQL query to be executed.
+        params (list, optional): Values bound to the `?` placeholders of the query.
+
+    Returns:
+        pyarrow.Table: The result of the SQL query as an Arrow table.
+    """
+    return _run_query_uncached(sql_query, params)
+
+@st.cache_data(persist="disk", max_entries=32, show_spinner=False)
+def run_example_query(sql_query, params=None):
+    """
+    Executes one of the canned example queries, caching the result on disk.
+
+    The examples are run by every learner in the workshop, so their results
+    are kept across sessions and app restarts until the database changes.
+
+    Args:
+        sql_query (str): The SQL query to be executed.
+        params (list, optional): Values bound to the `?` placeholders of the query.
+
+    Returns:
+        pyarrow.Table: The result of the SQL query as an Arrow table.
+    """
+    return _run_query_uncached(sql_query, params)
+
+def parse_query(sql_query):
+    """
+    Parses the given SQL without executing it.
+
+    Parsing is far cheaper than running the query, so SQL with a syntax
+    error is reported here and never sent for execution.
+
+    Args:
+        sql_query (str): The SQL query written by the user.
+
+    Returns:
+        list: The parsed statements, or None if the SQL does not parse.
+    """
+    cursor = get_connection().cursor()
+    try:
+        return cursor.extract_statements(sql_query)
+    except duckdb.Error as e:
+        st.error(f"Error: {e}")
+        return None
+    finally:
+        cursor.close()
+
+# Statement types that can change the data or schema of the database
+WRITE_STATEMENT_TYPES = {
+    duckdb.StatementType.INSERT, duckdb.StatementType.UPDATE,
+    duckdb.StatementType.DELETE, duckdb.StatementType.MERGE_INTO,
+    duckdb.StatementType.CREATE, duckdb.StatementType.CREATE_FUNC,
+    duckdb.StatementType.ALTER, duckdb.StatementType.DROP,
+    duckdb.StatementType.COPY, duckdb.StatementType.COPY_DATABASE,
+    duckdb.StatementType.EXECUTE, duckdb.StatementType.ATTACH,
+    duckdb.StatementType.DETACH, duckdb.StatementType.MULTI,
+}
+
+def changes_database(statements):
+    """
+    Tells whether any of the parsed statements can change the database.
+
+    Args:
+        statements (list): The statements returned by `parse_query`.
+
+    Returns:
+        bool: True if cached results must be dropped after running them.
+    """
+    return any(statement.type in WRITE_STATEMENT_TYPES for statement in statements)
+
+def get_preview_query(statements):
     """
-    Resets the database by deleting all records from a table 
-    and re-importing the data from a backup table.
+    Returns the query in a form that can be wrapped for paging.
+
+    Only a single SELECT statement can be paged; anything else (INSERT,
+    DELETE, several statements) returns None and is run as typed.
+
+    Args:
+        statements (list): The statements returned by `parse_query`.
+
+    Returns:
+        str: The SELECT statement without its trailing semicolon, or None.
     """
+    if statements is None or len(statements) != 1:
+        return None
+    if statements[0].type != duckdb.StatementType.SELECT:
+        return None
+    sql_query = statements[0].query
+    # The tokenizer skips comments, so this finds the closing semicolon
+    # even when a comment follows it
+    tokens = duckdb.tokenize(sql_query)
+    if tokens and sql_query[tokens[-1][0]] == ';':
+        sql_query = sql_query[:tokens[-1][0]]
+    return sql_query.strip()
+
+def bind_query(sql_query):
+    """
+    Checks that a SELECT query binds, without running it.
+
+    Errors are reported against the query as typed, so their line numbers
+    and the parameters they mention match the editor, not the paging wrapper.
+
+    Args:
+        sql_query (str): A SELECT query, as returned by `get_preview_query`.
+
+    Returns:
+        bool: True if the query binds and can be wrapped for paging.
+    """
+    cursor = get_connection().cursor()
     try:
-        get_connection().close()
+        # A relation is only bound here; nothing runs until it is fetched
+        cursor.sql(sql_query)
+        return True
     except duckdb.Error:
-        pass
+        # Relation errors carry no position; executing the bare query stops at
+        # the same binding error and reports it with the line and caret
+        _run_query_uncached(sql_query)
+        return False
+    finally:
+        cursor.close()
+
+def run_query_paginated(sql_query, limit, offset, query_runner=run_query):
+    """
+    Executes one page of the given SELECT query along with its total row count.
+
+    COUNT(*) OVER () is added to the page, so a single scan answers both
+    which rows to show and how many rows there are in total. The limit and
+    offset are bound as parameters. The query is bound on its own first, so
+    mistakes in it are reported against the text the user typed.
+
+    Args:
+        sql_query (str): A SELECT query, as returned by `get_preview_query`.
+        limit (int): The number of rows in a page.
+        offset (int): The number of rows to skip.
+        query_runner (function, optional): The cached runner used to execute it.
+
+    Returns:
+        tuple: The requested page as a pyarrow.Table and the total number of
+        rows, which is None if the query failed and 0 if the page is empty.
+    """
+    if not bind_query(sql_query):
+        return pa.table({}), None
+    # The query starts on the first line, so errors raised while it runs keep its line numbers
+    page = query_runner("SELECT *, COUNT(*) OVER () AS __total FROM (" + sql_query
+                        + "\n) _preview LIMIT ? OFFSET ?;", [limit, offset])
+    if page.num_columns == 0:
+        return page, None
+    total_rows = page.column(page.num_columns - 1)[0].as_py() if page.num_rows else 0
+    return page.remove_column(page.num_columns - 1), total_rows
+
+@st.cache_resource()
+def get_db_version():
+    """
+    Returns the write counter shared by every session, bumped whenever a
+    statement changes the database.
+
+    Returns:
+        dict: Holds the current counter under 'version'.
+    """
+    return {"version": 0}
+
+@st.cache_data(max_entries=1)
+def get_table_counts(db_version):
+    """
+    Returns the exact row count of every table in the database.
+
+    The UNION ALL count query is assembled by DuckDB itself from
+    information_schema.tables, so no per-table SQL is built in Python.
+
+    Args:
+        db_version (int): The current write counter; counts are only
+            recomputed once it changes.
+
+    Returns:
+        pyarrow.Table: One row per table with 'Table Name' and 'Row Count'.
+    """
+    count_query = run_query("""SELECT string_agg(
+                                   'SELECT ''' || replace(table_name, '''', '''''') || ''' AS "Table Name", '
+                                   || 'COUNT(1) AS "Row Count" FROM "'
+                                   || replace(table_name, '"', '""') || '"',
+                                   ' UNION ALL ' ORDER BY table_name)
+                               FROM information_schema.tables;""")
+    if count_query.num_rows == 0 or not count_query.column(0)[0].is_valid:
+        return pa.table({})
+    return run_query(count_query.column(0)[0].as_py())
+
+@st.cache_data(ttl=300)
+def get_columns():
+    """
+    Returns the column metadata of every table, fetched in a single query.
+
+    Returns:
+        dict: Maps each table name to a DataFrame with the ordinal position,
+        name and data type of its columns.
+    """
+    all_columns = run_query("""SELECT table_name,
+                               ordinal_position as 'Ordinal Position',
+                               column_name as 'Column Name',
+                               data_type as 'Data Type'
+                               FROM information_schema.columns
+                               ORDER BY table_name, ordinal_position;""").to_pandas()
+    if all_columns.empty:
+        return {}
+    return {table_name: columns.drop(columns='table_name')
+            for table_name, columns in all_columns.groupby('table_name', sort=False)}
+
+def clear_cached_results():
+    """
+    Drops every cached query result so the next rerun reads the database again.
+    """
+    run_query.clear()
+    run_example_query.clear()
+    get_columns.clear()
+    get_db_version()["version"] += 1
 
-    if os.path.exists("sample.db"):
-        os.remove("sample.db")
+def _quote_identifier(name):
+    """
+    Quotes a table, view or sequence name for use in a DDL statement,
+    where names cannot be bound as parameters.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+def _drop_all_objects(conn):
+    """
+    Drops every view, table and sequence in the main schema.
 
-    get_connection.clear()
-    conn = get_connection()
-    conn.execute("IMPORT DATABASE 'backup_data';")
+    Tables are dropped in foreign key order, since DuckDB refuses to drop a
+    table that another table still references.
+
+    Args:
+        conn (Connection): The connection to drop the objects with.
+    """
+    views = conn.execute("""SELECT view_name FROM duckdb_views()
+                            WHERE NOT internal AND schema_name = 'main';""").fetchall()
+    for (view_name,) in views:
+        conn.execute(f"DROP VIEW {_quote_identifier(view_name)};")
+
+    tables = {table_name for (table_name,) in conn.execute(
+        "SELECT table_name FROM duckdb_tables() WHERE schema_name = 'main';").fetchall()}
+    foreign_keys = conn.execute("""SELECT table_name, referenced_table FROM duckdb_constraints()
+                                   WHERE constraint_type = 'FOREIGN KEY'
+                                   AND schema_name = 'main';""").fetchall()
+    while tables:
+        referenced = {referenced_table for table_name, referenced_table in foreign_keys
+                      if table_name in tables and table_name != referenced_table}
+        for table_name in tables - referenced:
+            conn.execute(f"DROP TABLE {_quote_identifier(table_name)};")
+        tables &= referenced
+
+    sequences = conn.execute(
+        "SELECT sequence_name FROM duckdb_sequences() WHERE schema_name = 'main';").fetchall()
+    for (sequence_name,) in sequences:
+        conn.execute(f"DROP SEQUENCE {_quote_identifier(sequence_name)};")
+
+def reset_database():
+    """
+    Resets the database in place by dropping every object
+    and re-importing the data from the backup directory.
+
+    The cached connection stays open, so other sessions are not cut off
+    and the DuckDB buffer pool stays warm.
+    """
+    conn = get_connection().cursor()
+    try:
+        conn.execute("BEGIN TRANSACTION;")
+        _drop_all_objects(conn)
+        # Replays schema.sql, then bulk loads each table from its Parquet file
+        conn.execute("IMPORT DATABASE 'backup_data';")
+        conn.execute("COMMIT;")
+    except duckdb.Error as e:
+        conn.execute("ROLLBACK;")
+        conn.close()
+        st.error(f"Error: {e}")
+        return
+    try:
+        # Fold the reset into sample.db now; DuckDB cannot replay a WAL that
+        # drops tables with foreign keys, so leaving one would break the next start
+        conn.execute("CHECKPOINT;")
+    except duckdb.Error as e:
+        st.error(f"Error: {e}")
+    finally:
+        conn.close()
+    clear_cached_results()
 
 
     # with open("contoso_db.sql", "r", encoding="utf-8") as f:
@@ -71,6 +374,65 @@ def reset_database():
     st.success("Database reset to original state!")
 
 
+def _fingerprint_dataframe(df):
+    """
+    Cheap stand-in for hashing a whole DataFrame: its columns, dtypes,
+    length and first and last rows.
+    """
+    return (tuple(df.columns), tuple(df.dtypes.astype(str)), len(df),
+            df.head(1).values.tolist(), df.tail(1).values.tolist())
+
+@st.cache_data(hash_funcs={pd.DataFrame: _fingerprint_dataframe}, show_spinner=False)
+def _make_scatter_fig(x_axis, y_axis, df):
+    """
+    Builds the Plotly scatter figure, cached so reruns reuse the trace.
+
+    Returns:
+        plotly.graph_objects.Figure: The scatter plot of y_axis against x_axis.
+    """
+    # Imported here so plotly only loads once a scatter plot is requested
+    import plotly.express as px
+    # SVG slows down badly past about a thousand points, WebGL does not
+    render_mode = 'svg' if len(df) < 1000 else 'webgl'
+    return px.scatter(df, x=x_axis, y=y_axis, render_mode=render_mode)
+
+def _downsample(df, x_axis, y_axis, n_out=2000):
+    """
+    Reduces a long series to about n_out rows with M4 aggregation.
+
+    DuckDB scans the dataframe in place, orders it along the x-axis and
+    splits it into buckets, keeping the first, last, minimum and maximum
+    point of each. Only the plotted columns are returned, so the drawn line
+    looks the same while far fewer bytes are sent to the browser.
+
+    Parameters:
+    - df: pandas.DataFrame - The dataframe to plot.
+    - x_axis: str - The column on the X-axis.
+    - y_axis: str - The numeric column on the Y-axis.
+    - n_out: int - The number of rows above which the data is reduced.
+    """
+    if len(df) <= n_out or not pd.api.types.is_numeric_dtype(df[y_axis]):
+        return df
+    columns = ", ".join(_quote_identifier(name) for name in dict.fromkeys([x_axis, y_axis]))
+    cursor = get_connection().cursor()
+    try:
+        cursor.register("plot_df", df)
+        return _fetch_arrow(cursor.execute(f"""WITH ordered AS (
+                                      SELECT {columns}, {_quote_identifier(y_axis)} AS __y,
+                                      row_number() OVER (ORDER BY {_quote_identifier(x_axis)}) AS __pos
+                                      FROM plot_df WHERE {_quote_identifier(y_axis)} IS NOT NULL),
+                                  bucketed AS (
+                                      SELECT *, (__pos - 1) * ? // COUNT(*) OVER () AS __bucket
+                                      FROM ordered)
+                                  SELECT {columns} FROM bucketed
+                                  WINDOW bucket AS (PARTITION BY __bucket)
+                                  QUALIFY __pos IN (min(__pos) OVER bucket, max(__pos) OVER bucket,
+                                                    arg_min(__pos, __y) OVER bucket,
+                                                    arg_max(__pos, __y) OVER bucket)
+                                  ORDER BY __pos;""", [n_out // 4]))
+    finally:
+        cursor.close()
+
 def dynamic_visualization(df):
     """
     Dynamically visualize a pandas dataframe using Streamlit.
@@ -101,18 +463,90 @@ def dynamic_visualization(df):
     try:
         # Generate the selected type of visualization
         if chart_type == "Line Chart":
-            st.line_chart(df.set_index(x_axis)[y_axis])
+            st.line_chart(_downsample(df, x_axis, y_axis), x=x_axis, y=y_axis)
         elif chart_type == "Bar Chart":
-            st.bar_chart(df.set_index(x_axis)[y_axis])
+            st.bar_chart(df, x=x_axis, y=y_axis)
         elif chart_type == "Scatter Plot":
-            st.plotly_chart(px.scatter(df, x=x_axis, y=y_axis))
+            st.plotly_chart(_make_scatter_fig(x_axis, y_axis, df))
         elif chart_type == "Area Chart":
-            st.area_chart(df.set_index(x_axis)[y_axis])
-    except (TypeError, ValueError, KeyError) as e:
+            st.area_chart(_downsample(df, x_axis, y_axis), x=x_axis, y=y_axis)
+    except (TypeError, ValueError, KeyError, NotImplementedError) as e:
         st.error(f"""Try Choose Different Columns for the visualisation.\n\n
                  Error: {e}""")
 
 
+def _chart_frame(result):
+    """
+    Converts a query result into the DataFrame handed to the charts.
+
+    Arrow decimals (DuckDB's DECIMAL and HUGEINT) are cast to float64 first,
+    since the charts only treat plain numbers as a quantitative axis.
+    Intervals are turned into a number of days, since neither pandas nor the
+    charts can handle Arrow intervals or durations.
+
+    Parameters:
+    - result: pyarrow.Table - The query result to visualize.
+    """
+    for i, field in enumerate(result.schema):
+        if pa.types.is_decimal(field.type):
+            result = result.set_column(i, field.name, result.column(i).cast(pa.float64()))
+        elif pa.types.is_interval(field.type):
+            # Arrow cannot cast intervals, so count a month as 30 days like DuckDB's epoch()
+            days = [None if v is None else v.months * 30 + v.days + v.nanoseconds / 86_400e9
+                    for v in result.column(i).to_pylist()]
+            result = result.set_column(i, field.name, pa.array(days, pa.float64()))
+    return result.to_pandas(types_mapper=pd.ArrowDtype)
+
+@st.fragment
+def visualization_panel(result, full_query=None, query_runner=run_query):
+    """
+    Shows the "Visualize Data" checkbox and, when ticked, the chart for the result.
+
+    Runs as a fragment, so ticking the checkbox or changing the chart type or
+    axes reruns only this panel instead of the whole page.
+
+    Parameters:
+    - result: pyarrow.Table - The query result to visualize.
+    - full_query: str - For a paged result, the query whose full result is charted
+      instead of the current page; it is only run once the checkbox is ticked.
+    - query_runner: function - The cached runner used to execute full_query.
+    """
+    if st.checkbox("Visualize Data"):
+        if full_query is not None:
+            result = query_runner(full_query)
+        dynamic_visualization(_chart_frame(result))
+
+@st.cache_data
+def load_markdown(path):
+    """
+    Reads a Markdown file once, so reruns do not read it from disk again.
+
+    Args:
+        path (str): The path of the Markdown file.
+
+    Returns:
+        str: The content of the file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+@st.cache_data(show_spinner=False)
+def render_erd_svg(dot):
+    """
+    Lays out a Graphviz diagram once and keeps the resulting SVG.
+
+    Args:
+        dot (str): The diagram in DOT language.
+
+    Returns:
+        str: The SVG markup, or None if the Graphviz executables are not installed.
+    """
+    import graphviz
+    try:
+        return graphviz.Source(dot).pipe(format='svg', encoding='utf-8')
+    except graphviz.ExecutableNotFound:
+        return None
+
 
 ###################### App Starts Here ######################
 
@@ -168,27 +602,88 @@ query = st.selectbox("Example Queries", options=list(example_queries.keys()))
 # SQL Query Editor
 
 
+# Keep the editor mounted across reruns; only remount it (with the new
+# example as its default) when a different example is picked
+if st.session_state.get("prev_query") != query:
+    st.session_state.prev_query = query
+    st.session_state.editor_revision = st.session_state.get("editor_revision", -1) + 1
+
 user_query = st_ace(language='sql',
                     placeholder="Write your SQL query here...",
                     value=example_queries[query],
-                    height=200)
+                    height=200,
+                    key=f"sql_editor_{st.session_state.editor_revision}")
 
 with st.spinner("Running Query..."):
-    result = run_query(user_query)
     st.markdown("#### Query Results")
-    st.info(f"**{result.shape[0]} {'row' if result.shape[0]==1 else 'rows'}** returned.")
-
-    st.dataframe(result)
-
-    if st.checkbox("Visualize Data"):
-        dynamic_visualization(result)
-
-
-tables = run_query("SELECT table_name FROM information_schema.tables order by table_name;")
+    statements = parse_query(user_query)
+    preview_query = get_preview_query(statements)
+    first_row = 0
+    chart_query, query_runner = None, run_query
+    if not statements:
+        # Nothing to run, or a syntax error that parse_query already reported
+        result = display_result = pa.table({})
+        total_rows = 0
+    elif preview_query is None:
+        # Statements that cannot be paged (INSERT, DELETE, EXPLAIN, ...) run as typed
+        if changes_database(statements):
+            result = _run_query_uncached(user_query)
+            clear_cached_results()
+        else:
+            # Read-only statements leave every cached result valid
+            result = run_query(user_query)
+        total_rows = result.num_rows
+        # Only ship a capped number of rows to the browser
+        display_result = result.slice(0, st.session_state.get("max_display", 1000))
+    else:
+        # Unedited example queries are shared by every learner, so cache them on disk
+        query_runner = run_example_query if user_query == example_queries[query] else run_query
+        page_col, page_size_col = st.columns(2)
+        page_size = st.session_state.get("page_size", 1000)
+        # A different query or page size starts again from the first page
+        if st.session_state.get("prev_paging") != (preview_query, page_size):
+            st.session_state.prev_paging = (preview_query, page_size)
+            st.session_state.page = 1
+        page = st.session_state.get("page", 1)
+        result, total_rows = run_query_paginated(preview_query, limit=page_size,
+                                                 offset=(page - 1) * page_size,
+                                                 query_runner=query_runner)
+        if total_rows == 0 and page > 1:
+            # The page is past the end of this result, go back to the first one
+            page = st.session_state.page = 1
+            result, total_rows = run_query_paginated(preview_query, limit=page_size, offset=0,
+                                                     query_runner=query_runner)
+        if total_rows is None:
+            result, total_rows = pa.table({}), 0
+        else:
+            page_size_col.selectbox("Rows per page", options=[100, 500, 1000, 5000],
+                                    index=2, key="page_size")
+            page_count = max(1, math.ceil(total_rows / page_size))
+            page_col.number_input("Page", min_value=1, max_value=page_count, key="page")
+            first_row = (page - 1) * page_size
+            # Chart every row, not just the page on screen
+            chart_query = preview_query
+        display_result = result
+
+    shown_rows = display_result.num_rows
+    if shown_rows < total_rows:
+        st.info(f"**{total_rows} rows** returned (showing rows {first_row + 1}"
+                f" to {first_row + shown_rows}).")
+    else:
+        st.info(f"**{total_rows} {'row' if total_rows==1 else 'rows'}** returned.")
+
+    st.dataframe(display_result)
+
+    visualization_panel(result, chart_query, query_runner)
+
+
+# Table names come from the cached column metadata, so no separate
+# information_schema.tables lookup is needed
+columns_by_table = get_columns()
 col0, col1, col2 = st.columns([2, 1, 2])
 # Display the tables and their columns in the database with st.expander
 
-if tables.shape[0] == 0:
+if not columns_by_table:
     st.warning("No tables found in the database!")
     with st.spinner("Resetting database..."):
         reset_database()
@@ -207,31 +702,20 @@ with col0:
 
 col1.markdown("## Tables")
 with col1:
-    SQL_QUERY = ""
-    for index, row in tables.iterrows():
-        SQL_QUERY += f"""select '{row['table_name']}' as 'Table Name',
-                         count(1) as 'Row Count' from {row['table_name']}
-                         UNION ALL """
-    SQL_QUERY = SQL_QUERY[:-11] #to remove the last UNION ALL
-    table_counts = run_query(SQL_QUERY)
+    table_counts = get_table_counts(get_db_version()["version"])
     st.dataframe(table_counts, hide_index=True)
 
 col2.markdown("## Columns")
 with col2:
-    for index, row in tables.iterrows():
-        with st.expander(f"{row['table_name']}", expanded=False):
-            columns = run_query(f"""SELECT ordinal_position as 'Ordinal Position',
-                                column_name as 'Column Name',
-                                data_type as 'Data Type'
-                                FROM information_schema.columns
-                                WHERE table_name = '{row['table_name']}';""")
+    for table_name, columns in columns_by_table.items():
+        with st.expander(table_name, expanded=False):
             st.dataframe(columns, hide_index=True)
 
 st.markdown('---')
 st.markdown('## Entity Relationship Diagram')
 st.markdown('---')
 # Create a graphlib graph object
-st.graphviz_chart(r'''
+erd_dot = r'''
     digraph ERDiagram {
                                     
         node [shape=record, style=filled, fillcolor=gray95, margin=0.1, height=0, width=0];
@@ -247,7 +731,13 @@ st.graphviz_chart(r'''
         Products -> LineItems [label="ProductId", taillabel="1", headlabel="*"];
                 
     }
-''')
+'''
+erd_svg = render_erd_svg(erd_dot)
+if erd_svg:
+    st.image(erd_svg)
+else:
+    # Without the dot executable, fall back to laying the diagram out in the browser
+    st.graphviz_chart(erd_dot)
 
 
 st.markdown('---')
@@ -318,328 +808,11 @@ st.markdown('---')
 st.markdown('## Detailed SQL Querying Cheatsheet')
 st.markdown('---')
 
-st.markdown("""
-## Basic CRUD Operations
-
-### Create: `INSERT`
-- **Definition:** Adds new rows to a table.
-- **Syntax:** `INSERT INTO table_name (column1, column2) VALUES (value1, value2);`
-- **Example Query:** 
-  ```sql
-  INSERT INTO Customers (FirstName, LastName, Email) VALUES ('John', 'Doe', 'john.doe@email.com');
-  ```
-- **Expected Result Definition:** A new row is added to the `Customers` table with John Doe's details.
-
-### Read: `SELECT`
-- **Definition:** Retrieves data from one or more tables.
-- **Syntax:** `SELECT column1, column2 FROM table_name WHERE condition;`
-- **Example Query:** 
-  ```sql
-  SELECT FirstName, LastName FROM Customers WHERE CustomerId = 1;
-  ```
-- **Expected Result Definition:** Displays the first and last name of the customer with `CustomerId` 1.
-
-### Update: `UPDATE`
-- **Definition:** Modifies existing records in a table.
-- **Syntax:** `UPDATE table_name SET column1 = value1, column2 = value2 WHERE condition;`
-- **Example Query:** 
-  ```sql
-  UPDATE Customers SET Address = '123 New Location' WHERE CustomerId = 1;
-  ```
-- **Expected Result Definition:** Changes the address of the customer with `CustomerId` 1 to '123 New Location'.
-
-### Delete: `DELETE`
-- **Definition:** Removes existing records from a table.
-- **Syntax:** `DELETE FROM table_name WHERE condition;`
-- **Example Query:** 
-  ```sql
-  DELETE FROM Customers WHERE CustomerId = 1;
-  ```
-- **Expected Result Definition:** Deletes the record of the customer with `CustomerId` 1 from the `Customers` table.
-Let's expand on the filtering data with `WHERE` clause section, providing more detailed examples for each operator, including logical and comparison operators.
-
----
-            
-## Filtering using the `WHERE` Clause
-
-### Logical Operators: `AND`, `OR`, `NOT`
-
-- **`AND` Operator Example:**
-  - **Query:** Find all customers who are from "Tech Galaxy" company and live at "123 Space Street".
-    ```sql
-    SELECT * FROM Customers WHERE Company = 'Tech Galaxy' AND Address = '123 Space Street';
-    ```
-  - **Expected Result:** Retrieves customer records belonging to "Tech Galaxy" located at "123 Space Street".
-
-- **`OR` Operator Example:**
-  - **Query:** Select products that either have "Red" color or weigh more than 20 units.
-    ```sql
-    SELECT Name FROM Products WHERE Colour = 'Red' OR Weight > 20;
-    ```
-  - **Expected Result:** Lists names of "Red" products or those weighing over 20 units, possibly including some that meet both conditions.
-
-- **`NOT` Operator Example:**
-  - **Query:** Find customers who do not have an email address from "example.com".
-    ```sql
-    SELECT FirstName, LastName FROM Customers WHERE NOT Email LIKE '%@example.com';
-    ```
-  - **Expected Result:** Displays first and last names of customers whose email doesn't end with "@example.com".
-
-### Comparison Operators: `=`, `<>`, `>`, `<`, `BETWEEN`
-
-- **`=` Operator Example:**
-  - **Query:** Retrieve the list of orders placed by Customer ID 10.
-    ```sql
-    SELECT OrderId FROM Orders WHERE CustomerId = 10;
-    ```
-  - **Expected Result:** Shows Order IDs for all orders placed by the customer with ID 10.
-
-- **`<>` Operator Example:**
-  - **Query:** Select products that are not colored "Blue".
-    ```sql
-    SELECT Name FROM Products WHERE Colour <> 'Blue';
-    ```
-  - **Expected Result:** Lists names of products that are of any color other than "Blue".
-
-- **`>` Operator Example:**
-  - **Query:** Find products with a list price greater than 500.
-    ```sql
-    SELECT Name, ListPrice FROM Products WHERE ListPrice > 500;
-    ```
-  - **Expected Result:** Retrieves the names and list prices of products priced above 500.
-
-- **`<` Operator Example:**
-  - **Query:** Identify customers who have placed less than 3 orders.
-    - This example requires a subquery since it involves counting orders per customer.
-    ```sql
-    SELECT CustomerId, COUNT(OrderId) AS TotalOrders FROM Orders GROUP BY CustomerId HAVING COUNT(OrderId) < 3;
-    ```
-  - **Expected Result:** Lists Customer IDs along with their total orders, for those having fewer than 3 orders.
-
-- **`BETWEEN` Operator Example:**
-  - **Query:** Select all orders placed between January 1, 2023, and March 31, 2023.
-    ```sql
-    SELECT OrderId FROM Orders WHERE DatePlaced BETWEEN '2023-01-01' AND '2023-03-31';
-    ```
-  - **Expected Result:** Shows Order IDs for orders placed in the first quarter of 2023.
-
-### List of Values: `IN`
-- **Definition:** Specifies multiple values in a `WHERE` clause.
-- **Syntax:** `SELECT column1 FROM table_name WHERE column1 IN (value1, value2);`
-- **Example Query:** 
-  ```sql
-  SELECT FirstName, LastName FROM Customers WHERE CustomerId IN (1, 2, 3);
-  ```
-- **Expected Result Definition:** Selects the names of customers with `CustomerId` 1, 2, or 3.
-
-### Wildcard Operator: `LIKE`
-- **Definition:** Searches for a specified pattern in a column.
-- **Syntax:** `SELECT column1 FROM table_name WHERE column1 LIKE pattern;`
-- **Example Query:** 
-  ```sql
-  SELECT FirstName FROM Customers WHERE FirstName LIKE 'Jo%';
-  ```
-- **Expected Result Definition:** Lists first names that start with "Jo".
-
-### `NULL` Values: `IS NULL`
-- **Definition:** Finds rows where the column value is NULL.
-- **Syntax:** `SELECT column1 FROM table_name WHERE column1 IS NULL;`
-- **Example Query:** 
-  ```sql
-  SELECT CustomerId FROM Customers WHERE Phone IS NULL;
-  ```
-- **Expected Result Definition:** Lists `CustomerId`s for customers with no phone number.
-
-## Aggregating Data Using Functions
-
-### Count Records: `COUNT(*)`
-- **Definition:** Counts the number of rows in a table or set.
-- **Syntax:** `SELECT COUNT(*) FROM table_name WHERE condition;`
-- **Example Query:** 
-  ```sql
-  SELECT COUNT(*) FROM Orders WHERE Status = 'Completed';
-  ```
-- **Expected Result Definition:** Returns the number of completed orders.
-
-### Sum of a particular column: `SUM(COLUMN)`
-- **Definition:** Sums up the numeric values of a specified column.
-- **Syntax:** `SELECT SUM(column_name) FROM table_name WHERE condition;`
-- **Example Query:** 
-  ```sql
-  SELECT SUM(Quantity) FROM LineItems WHERE OrderId = 1;
-  ```
-- **Expected Result Definition:** Totals the quantity of all line items for order with `OrderId` 1.
-
-### Column Value: `AVG / MIN / MAX(COLUMN)`
-- **Definition:** Calculates the average, minimum, or maximum value of a specified column.
-- **Syntax for AVG:** `SELECT AVG(column_name) FROM table_name WHERE condition;`
-- **Syntax for MIN:** `SELECT MIN(column_name) FROM table_name WHERE condition;`
-- **Syntax for MAX:** `SELECT MAX(column_name) FROM table_name WHERE condition;`
-- **Example Query for AVG:** 
-  ```sql
-  SELECT AVG(ListPrice) FROM Products;
-  ```
-- **Expected Result Definition for AVG:** Returns the average list price of all products.
-- **Example Query for MIN:** 
-  ```sql
-  SELECT MIN(ListPrice) FROM Products;
-  ```
-- **Expected Result Definition for MIN:** Finds the lowest list price among all products.
-- **Example Query for MAX:** 
-  ```sql
-  SELECT MAX(ListPrice) FROM Products;
-  ```
-- **Expected Result Definition for MAX:** Identifies the highest list price in the product catalog.
-
-### Slice/Dice by Column: `(GROUP BY) (HAVING)`
-- **Definition:** Groups rows sharing a property so that an aggregate function can be applied to each group.
-- **Syntax:** `SELECT column1, AGG_FUNC(column2) FROM table_name GROUP BY column1 HAVING condition;`
-- **Example Query:** 
-  ```sql
-  SELECT CustomerId, COUNT(OrderId) FROM Orders GROUP BY CustomerId HAVING COUNT(OrderId) > 5;
-  ```
-- **Expected Result Definition:** Lists customers who have placed more than 5 orders, along with the number of orders they placed.
-
-## Remove Duplicates and Find Unique Values
-
-### `DISTINCT`
-- **Definition:** Returns unique values in the specified column(s).
-- **Syntax:** `SELECT DISTINCT column1 FROM table_name;`
-- **Example Query:** 
-  ```sql
-  SELECT DISTINCT Status FROM Orders;
-  ```
-- **Expected Result Definition:** Lists all unique order statuses.
-
-### `GROUP BY + COUNT + HAVING` to find duplicates and their count
-- **Example Query:** 
-  ```sql
-  SELECT Email, COUNT(*) FROM Customers GROUP BY Email HAVING COUNT(*) > 1;
-  ```
-- **Expected Result Definition:** Finds duplicate email addresses in the `Customers` table and shows how many times each appears.
-
-## Different Ways to Join Tables
-
-### `INNER JOIN`
-- **Definition:** Combines rows from two or more tables based on a related column between them.
-- **Syntax:** `SELECT table1.column, table2.column FROM table1 INNER JOIN table2 ON table1.common_column = table2.common_column;`
-- **Example Query:** 
-  ```sql
-  SELECT Customers.FirstName, Orders.OrderId FROM Customers INNER JOIN Orders ON Customers.CustomerId = Orders.CustomerId;
-  ```
-- **Expected Result Definition:** Shows the first name of customers along with their order IDs.
-
-### `LEFT JOIN`
-- **Definition:** Returns all records from the left table, and the matched records from the right table.
-- **Syntax:** `SELECT table1.column, table2.column FROM table1 LEFT JOIN table2 ON table1.common_column = table2.common_column;`
-- **Example Query:** 
-  ```sql
-  SELECT Customers.FirstName, Orders.OrderId FROM Customers LEFT JOIN Orders ON Customers.CustomerId = Orders.CustomerId;
-  ```
-- **Expected Result Definition:** Lists all customers and their orders if they have any. Customers without orders will still appear, with NULL in the `OrderId` column.
-
-## Sorting and Ordering data using `ORDER BY`
-- **Definition:** Orders the result set of a query by specified column(s).
-- **Syntax:** `SELECT column1 FROM table_name ORDER BY column1 ASC|DESC;`
-- **Example Query:** 
-  ```sql
-  SELECT Name, ListPrice FROM Products ORDER BY ListPrice DESC;
-  ```
-- **Expected Result Definition:** Lists products in descending order of their list price.
-
-## Using subqueries within queries
-- **Definition:** A query nested inside another query.
-- **Syntax:** `SELECT column1 FROM (SELECT column1 FROM table_name) AS subquery;`
-- **Example Query:** 
-  ```sql
-  SELECT AVG(Price) FROM (SELECT ListPrice AS Price FROM Products) AS ProductPrices;
-  ```
-- **Expected Result Definition:** Calculates the average price of all products by treating the list prices as a subquery.
-
-""")
+st.markdown(load_markdown('cheatsheet/detailed_cheatsheet.md'))
 st.markdown('---')
 st.markdown('## Additional SQL Concepts - Good To Know')
 st.markdown('### Data Manipulation Functions')
-st.markdown("""
-#### `CONCAT` Function: Concatenates Two or More Strings
-- **Syntax:** `CONCAT(string1, string2, ..., stringN)`
-- **Example:** Combine a customer's first name and last name into a full name.
-  ```sql
-  SELECT CONCAT(FirstName, ' ', LastName) AS FullName FROM Customers;
-  ```
-- **Explanation:** This query creates a new string for each record by combining `FirstName` and `LastName` with a space in between.
-
-#### `ISNULL` Function: Replaces `NULL` with a Specified Value
-- **Syntax:** `ISNULL(expression, replacement)`
-- **Example:** Provide a default text where there's no phone number.
-  ```sql
-  SELECT FirstName, ISNULL(Phone, 'No Phone Provided') AS Phone FROM Customers;
-  ```
-- **Explanation:** If the `Phone` column contains NULL for a record, 'No Phone Provided' is returned instead.
-
-#### `COALESCE` Function: Returns the First Non-NULL Value in the List
-- **Syntax:** `COALESCE(expression1, expression2, ..., expressionN)`
-- **Example:** Get the first available contact detail for a customer.
-  ```sql
-  SELECT FirstName, COALESCE(Email, Phone, 'No Contact Info Available') AS ContactInfo FROM Customers;
-  ```
-- **Explanation:** For each customer, the query returns the first non-null value out of `Email` and `Phone`. If both are NULL, it returns 'No Contact Info Available'.
-
-#### `CASE` Statement: Implements Conditional Logic
-- **Syntax:** 
-  ```sql
-  CASE 
-    WHEN condition1 THEN result1
-    WHEN condition2 THEN result2
-    ...
-    ELSE default_result
-  END
-  ```
-- **Example:** Categorize products based on their list price.
-  ```sql
-  SELECT Name,
-         CASE 
-           WHEN ListPrice >= 100 THEN 'Expensive'
-           WHEN ListPrice < 100 AND ListPrice > 50 THEN 'Moderate'
-           ELSE 'Cheap'
-         END AS PriceCategory
-  FROM Products;
-  ```
-- **Explanation:** Each product is classified as 'Expensive', 'Moderate', or 'Cheap' based on its `ListPrice`.
-
-#### `CAST` Function: Converts Data Types
-- **Syntax:** `CAST(expression AS data_type(length))`
-- **Example:** Convert the price to an integer type.
-  ```sql
-  SELECT Name, CAST(ListPrice AS INT) AS PriceInteger FROM Products;
-  ```
-- **Explanation:** Converts the `ListPrice` from a decimal or float to an integer.
-
-#### `TRIM` Function: Removes Leading and Trailing Spaces
-- **Syntax:** `TRIM([characters FROM] string)`
-- **Example:** Trim spaces from customer names.
-  ```sql
-  SELECT TRIM(FirstName) AS TrimmedFirstName FROM Customers;
-  ```
-- **Explanation:** Removes any leading or trailing spaces from the `FirstName` values.
-
-#### `UPPER` and `LOWER` Functions: Converts Text to Uppercase or Lowercase
-- **Syntax for UPPER:** `UPPER(string)`
-- **Syntax for LOWER:** `LOWER(string)`
-- **Example:** Convert names to uppercase.
-  ```sql
-  SELECT UPPER(FirstName) AS UpperCaseName FROM Customers;
-  ```
-- **Explanation:** Converts all characters in `FirstName` to uppercase.
-
-#### `ROUND` Function: Rounds a Number to a Specified Number of Decimal Places
-- **Syntax:** `ROUND(number, decimals)`
-- **Example:** Round the list price to 2 decimal places.
-  ```sql
-  SELECT Name, ROUND(ListPrice, 2) AS RoundedPrice FROM Products;
-  ```
-- **Explanation:** Adjusts the `ListPrice` of each product to a number with 2 decimal places.
-""")
+st.markdown(load_markdown('cheatsheet/data_manipulation_functions.md'))
 
 if st.checkbox("Admin Panel"):
     if st.button("Reset Database"):
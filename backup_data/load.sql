@@ -1,4 +1,4 @@
-COPY Products FROM 'new_data/products_.csv' (FORMAT 'csv', quote '"', delimiter ',', header 1);
-COPY Customers FROM 'new_data/customers_.csv' (FORMAT 'csv', quote '"', delimiter ',', header 1);
-COPY Orders FROM 'new_data/orders_.csv' (FORMAT 'csv', quote '"', delimiter ',', header 1);
-COPY LineItems FROM 'new_data/lineitems_.csv' (FORMAT 'csv', quote '"', delimiter ',', header 1);
\ No newline at end of file
+COPY Products FROM 'backup_data/products_.parquet' (FORMAT 'parquet');
+COPY Customers FROM 'backup_data/customers_.parquet' (FORMAT 'parquet');
+COPY Orders FROM 'backup_data/orders_.parquet' (FORMAT 'parquet');
+COPY LineItems FROM 'backup_data/lineitems_.parquet' (FORMAT 'parquet');
\ No newline at end of file